@@ -56,6 +56,7 @@ from telegram.ext import (
 )
 from telegram.error import BadRequest
 from telegram.utils.helpers import DefaultValue, DEFAULT_NONE
+from telegram.utils.request import Request
 from tests.bots import get_bot
 
 
@@ -96,7 +97,9 @@ def bot(bot_info):
     ):  # Subclass Bot to allow monkey patching of attributes and functions, would
         pass  # come into effect when we __dict__ is dropped from slots
 
-    return DictExtBot(bot_info['token'], private_key=PRIVATE_KEY)
+    # More than one connection, so that concurrent requests (e.g. when cleaning up the test
+    # sticker sets) don't have to wait for each other or open throwaway connections
+    return DictExtBot(bot_info['token'], private_key=PRIVATE_KEY, request=Request(con_pool_size=8))
 
 
 DEFAULT_BOTS = {}
@@ -225,6 +228,16 @@ def pytest_configure(config):
     config.addinivalue_line('filterwarnings', 'ignore::ResourceWarning')
     # TODO: Write so good code that we don't need to ignore ResourceWarnings anymore
 
+    if env_var_2_bool(os.getenv('TEST_OFFICIAL')) and not hasattr(config, 'workerinput'):
+        # Download the Bot API docs once before any pytest-xdist workers start, so that they all
+        # read the cached copy instead of fetching it at the same time
+        from tests.test_official import fetch_bot_api_html
+
+        try:
+            fetch_bot_api_html()
+        except Exception:  # pylint: disable=broad-except
+            pass  # The tests will try again and report the error properly
+
 
 def make_bot(bot_info, **kwargs):
     """
@@ -16,213 +16,296 @@
 #
 # You should have received a copy of the GNU Lesser Public License
 # along with this program.  If not, see [http://www.gnu.org/licenses/].
+import functools
+import json
 import os
 import inspect
+import ssl
+import time
+from pathlib import Path
+from urllib.error import HTTPError
+from urllib.request import Request, urlopen
 
-import certifi
 import pytest
-from bs4 import BeautifulSoup
-from telegram.vendor.ptb_urllib3 import urllib3
 
 import telegram
 from tests.conftest import env_var_2_bool
 
+if not env_var_2_bool(os.getenv('TEST_OFFICIAL')):
+    pytest.skip('test_official is not enabled', allow_module_level=True)
+
+BOT_API_URL = 'https://core.telegram.org/bots/api'
+# Shared by all test runs (and pytest-xdist workers) of the current user. Not in the temp dir,
+# where other users could create the directory or plant a copy of the docs
+CACHE_DIR = Path(os.getenv('XDG_CACHE_HOME') or Path.home() / '.cache') / 'ptb'
+CACHE_FILE = CACHE_DIR / 'bot-api.html'
+CACHE_HEADERS_FILE = CACHE_DIR / 'bot-api.json'
+CACHE_TTL = 60 * 60  # seconds
+
+BOT_METHODS = {
+    name: getattr(telegram.Bot, name) for name in dir(telegram.Bot) if not name.startswith('_')
+}
+TELEGRAM_OBJECTS = {name: getattr(telegram, name) for name in telegram.__all__}
+
 IGNORED_OBJECTS = ('ResponseParameters', 'CallbackGame')
-IGNORED_PARAMETERS = {
-    'self',
-    'args',
-    '_kwargs',
-    'read_latency',
-    'network_delay',
-    'timeout',
-    'bot',
-    'api_kwargs',
+IGNORED_PARAMETERS = frozenset(
+    {
+        'self',
+        'args',
+        '_kwargs',
+        'read_latency',
+        'network_delay',
+        'timeout',
+        'bot',
+        'api_kwargs',
+    }
+)
+
+EMPTY = frozenset()
+SEND_MEDIA_METHODS = frozenset(
+    {
+        'sendAnimation',
+        'sendAudio',
+        'sendDocument',
+        'sendPhoto',
+        'sendVideo',
+        'sendVideoNote',
+        'sendVoice',
+    }
+)
+LOCATION_METHODS = frozenset({'sendLocation', 'editMessageLiveLocation'})
+# Maps method names to the parameters (removed, added) to/from IGNORED_PARAMETERS
+METHOD_IGNORED_PARAMETERS = {
+    # Has it's own timeout parameter that we do wanna check for
+    'getUpdates': (frozenset({'timeout'}), EMPTY),
+    # Convenience parameter
+    **{name: (EMPTY, frozenset({'filename'})) for name in SEND_MEDIA_METHODS},
+    # Added for ease of use
+    **{name: (EMPTY, frozenset({'location'})) for name in LOCATION_METHODS},
+    # TODO: Now deprecated, so no longer in telegrams docs
+    'setGameScore': (EMPTY, frozenset({'edit_message'})),
+    'sendContact': (EMPTY, frozenset({'contact'})),  # Added for ease of use
+    'sendVenue': (EMPTY, frozenset({'venue'})),  # Added for ease of use
+    'answerInlineQuery': (EMPTY, frozenset({'current_offset'})),  # Added for ease of use
+    # for backwards compatibility
+    'promoteChatMember': (EMPTY, frozenset({'can_manage_voice_chats'})),
+}
+
+# Fields that are documented for objects whose name starts with one of the given prefixes, but
+# which are set automatically by the respective classes
+TYPE_SKIPPED_FIELDS = {
+    'type': ('InlineQueryResult', 'InputMedia', 'BotCommandScope', 'MenuButton'),
+    'status': ('ChatMember',),
+    'source': ('PassportElementError',),
+}
+CHAT_MEMBER_IGNORED = frozenset(
+    {
+        # attributes common to all subclasses
+        'user',
+        'status',
+        'can_manage_video_chats',
+        # for backwards compatibility
+        'can_add_web_page_previews',
+        'can_be_edited',
+        'can_change_info',
+        'can_delete_messages',
+        'can_edit_messages',
+        'can_invite_users',
+        'can_manage_chat',
+        'can_manage_voice_chats',
+        'can_pin_messages',
+        'can_post_messages',
+        'can_promote_members',
+        'can_restrict_members',
+        'can_send_media_messages',
+        'can_send_messages',
+        'can_send_other_messages',
+        'can_send_polls',
+        'custom_title',
+        'is_anonymous',
+        'is_member',
+        'until_date',
+    }
+)
+OBJECT_EXTRA_IGNORED = {
+    'InlineQueryResult': frozenset({'id', 'type'}),  # attributes common to all subclasses
+    'ChatMember': CHAT_MEMBER_IGNORED,
+    'BotCommandScope': frozenset({'type'}),  # attributes common to all subclasses
+    'MenuButton': frozenset({'type'}),  # attributes common to all subclasses
+    'User': frozenset({'type'}),  # TODO: Deprecation
+    'PassportFile': frozenset({'credentials'}),
+    'EncryptedPassportElement': frozenset({'credentials'}),
+    'PassportElementError': frozenset({'message', 'type', 'source'}),
+    'ChatMemberAdministrator': frozenset({'can_manage_voice_chats'}),  # backwards compatibility
+    'Message': frozenset(
+        {
+            # for backwards compatibility
+            'voice_chat_ended',
+            'voice_chat_participants_invited',
+            'voice_chat_scheduled',
+            'voice_chat_started',
+        }
+    ),
 }
 
 
-def find_next_sibling_until(tag, name, until):
-    for sibling in tag.next_siblings:
-        if sibling is until:
-            return
-        if sibling.name == name:
-            return sibling
+@functools.lru_cache(maxsize=None)
+def get_signature(obj):
+    return inspect.signature(obj, follow_wrapped=True)
 
 
-def parse_table(h4):
-    table = find_next_sibling_until(h4, 'table', h4.find_next_sibling('h4'))
+def parse_table(table):
+    """Returns the names of the parameters/fields, i.e. the first column of the table."""
     if not table:
         return []
-    t = []
-    for tr in table.find_all('tr')[1:]:
-        t.append([td.text for td in tr.find_all('td')])
-    return t
+    return [tr.find('td', recursive=False).get_text() for tr in table.find_all('tr')[1:]]
 
 
-def check_method(h4):
-    name = h4.text
-    method = getattr(telegram.Bot, name)
-    table = parse_table(h4)
+def check_official(kind, name, parameters):
+    if kind == 'method':
+        obj = BOT_METHODS.get(name)
+        assert obj is not None, f"Method {name} not found in telegram.Bot"
+        skipped = EMPTY
+        removed, added = METHOD_IGNORED_PARAMETERS.get(name, (EMPTY, EMPTY))
+        ignored = (IGNORED_PARAMETERS - removed) | added
+    else:
+        obj = TELEGRAM_OBJECTS.get(name)
+        assert obj is not None, f"Class {name} not found in telegram"
+        skipped = {
+            field for field, prefixes in TYPE_SKIPPED_FIELDS.items() if name.startswith(prefixes)
+        }
+        skipped.add('remove_keyboard')
+        ignored = IGNORED_PARAMETERS | OBJECT_EXTRA_IGNORED.get(name, EMPTY)
+        if name.startswith('InputMedia'):
+            ignored |= {'filename'}  # Convenience parameter
 
     # Check arguments based on source
-    sig = inspect.signature(method, follow_wrapped=True)
+    sig = get_signature(obj)
 
-    checked = []
-    for parameter in table:
-        param = sig.parameters.get(parameter[0])
-        assert param is not None, f"Parameter {parameter[0]} not found in {method.__name__}"
-        # TODO: Check type via docstring
-        # TODO: Check if optional or required
-        checked.append(parameter[0])
-
-    ignored = IGNORED_PARAMETERS.copy()
-    if name == 'getUpdates':
-        ignored -= {'timeout'}  # Has it's own timeout parameter that we do wanna check for
-    elif name in (
-        f'send{media_type}'
-        for media_type in [
-            'Animation',
-            'Audio',
-            'Document',
-            'Photo',
-            'Video',
-            'VideoNote',
-            'Voice',
-        ]
-    ):
-        ignored |= {'filename'}  # Convenience parameter
-    elif name == 'setGameScore':
-        ignored |= {'edit_message'}  # TODO: Now deprecated, so no longer in telegrams docs
-    elif name == 'sendContact':
-        ignored |= {'contact'}  # Added for ease of use
-    elif name in ['sendLocation', 'editMessageLiveLocation']:
-        ignored |= {'location'}  # Added for ease of use
-    elif name == 'sendVenue':
-        ignored |= {'venue'}  # Added for ease of use
-    elif name == 'answerInlineQuery':
-        ignored |= {'current_offset'}  # Added for ease of use
-    elif name == 'promoteChatMember':
-        ignored |= {'can_manage_voice_chats'}  # for backwards compatibility
-
-    assert (sig.parameters.keys() ^ checked) - ignored == set()
-
-
-def check_object(h4):
-    name = h4.text
-    obj = getattr(telegram, name)
-    table = parse_table(h4)
-
-    # Check arguments based on source
-    sig = inspect.signature(obj, follow_wrapped=True)
-
-    checked = []
-    for parameter in table:
-        field = parameter[0]
-        if field == 'from':
-            field = 'from_user'
-        elif (
-            name.startswith('InlineQueryResult')
-            or name.startswith('InputMedia')
-            or name.startswith('BotCommandScope')
-            or name.startswith('MenuButton')
-        ) and field == 'type':
-            continue
-        elif (name.startswith('ChatMember')) and field == 'status':
-            continue
-        elif (
-            name.startswith('PassportElementError') and field == 'source'
-        ) or field == 'remove_keyboard':
+    checked = set()
+    for parameter in parameters:
+        if parameter in skipped:
             continue
+        if parameter == 'from':
+            parameter = 'from_user'
 
-        param = sig.parameters.get(field)
-        assert param is not None, f"Attribute {field} not found in {obj.__name__}"
+        param = sig.parameters.get(parameter)
+        assert param is not None, f"Parameter {parameter} not found in {obj.__name__}"
         # TODO: Check type via docstring
         # TODO: Check if optional or required
-        checked.append(field)
+        checked.add(parameter)
 
-    ignored = IGNORED_PARAMETERS.copy()
     if name == 'InputFile':
         return
-    if name == 'InlineQueryResult':
-        ignored |= {'id', 'type'}  # attributes common to all subclasses
-    if name == 'ChatMember':
-        ignored |= {
-            'user',
-            'status',
-            'can_manage_video_chats',
-        }  # attributes common to all subclasses
-    if name == 'ChatMember':
-        ignored |= {
-            'can_add_web_page_previews',  # for backwards compatibility
-            'can_be_edited',
-            'can_change_info',
-            'can_delete_messages',
-            'can_edit_messages',
-            'can_invite_users',
-            'can_manage_chat',
-            'can_manage_voice_chats',
-            'can_pin_messages',
-            'can_post_messages',
-            'can_promote_members',
-            'can_restrict_members',
-            'can_send_media_messages',
-            'can_send_messages',
-            'can_send_other_messages',
-            'can_send_polls',
-            'custom_title',
-            'is_anonymous',
-            'is_member',
-            'until_date',
-        }
-    if name == 'BotCommandScope':
-        ignored |= {'type'}  # attributes common to all subclasses
-    if name == 'MenuButton':
-        ignored |= {'type'}  # attributes common to all subclasses
-    elif name == 'User':
-        ignored |= {'type'}  # TODO: Deprecation
-    elif name in ('PassportFile', 'EncryptedPassportElement'):
-        ignored |= {'credentials'}
-    elif name == 'PassportElementError':
-        ignored |= {'message', 'type', 'source'}
-    elif name.startswith('InputMedia'):
-        ignored |= {'filename'}  # Convenience parameter
-    elif name == 'ChatMemberAdministrator':
-        ignored |= {'can_manage_voice_chats'}  # for backwards compatibility
-    elif name == 'Message':
-        # for backwards compatibility
-        ignored |= {
-            'voice_chat_ended',
-            'voice_chat_participants_invited',
-            'voice_chat_scheduled',
-            'voice_chat_started',
-        }
 
-    assert (sig.parameters.keys() ^ checked) - ignored == set()
+    # Every documented parameter was already looked up in the signature, so we only have to
+    # check for parameters that are missing in the docs
+    undocumented = [p for p in sig.parameters if p not in checked and p not in ignored]
+    if undocumented:
+        pytest.fail(f"{name} has the parameter(s) {undocumented}, which are not documented")
+
+
+def write_cache_file(path, data):
+    # Write to a temporary file first, so that concurrent runs never read a partial file
+    tmp_path = path.with_name(f'{path.name}.{os.getpid()}.tmp')
+    tmp_path.write_bytes(data)
+    os.replace(tmp_path, path)
+
 
+@functools.lru_cache(maxsize=1)
+def fetch_bot_api_html():
+    """Downloads the Bot API docs. A local copy is kept in :attr:`CACHE_FILE`. It's used as is for
+    :attr:`CACHE_TTL` seconds and afterwards reused as long as the server reports the docs as
+    unchanged (based on the ETag/Last-Modified headers).
+    """
+    import certifi
 
-argvalues = []
-names = []
-http = urllib3.PoolManager(cert_reqs='CERT_REQUIRED', ca_certs=certifi.where())
-request = http.request('GET', 'https://core.telegram.org/bots/api')
-soup = BeautifulSoup(request.data.decode('utf-8'), 'html.parser')
+    headers = {}
+    if CACHE_FILE.is_file():
+        if time.time() - CACHE_FILE.stat().st_mtime < CACHE_TTL:
+            return CACHE_FILE.read_bytes()
 
-for thing in soup.select('h4 > a.anchor'):
-    # Methods and types don't have spaces in them, luckily all other sections of the docs do
-    # TODO: don't depend on that
-    if '-' not in thing['name']:
-        h4 = thing.parent
+        if CACHE_HEADERS_FILE.is_file():
+            cached_headers = json.loads(CACHE_HEADERS_FILE.read_text())
+            if 'ETag' in cached_headers:
+                headers['If-None-Match'] = cached_headers['ETag']
+            if 'Last-Modified' in cached_headers:
+                headers['If-Modified-Since'] = cached_headers['Last-Modified']
 
+    context = ssl.create_default_context(cafile=certifi.where())
+    try:
+        with urlopen(Request(BOT_API_URL, headers=headers), context=context) as response:
+            html = response.read()
+            response_headers = {
+                name: response.headers[name]
+                for name in ('ETag', 'Last-Modified')
+                if response.headers.get(name)
+            }
+    except HTTPError as exc:
+        if exc.code != 304:
+            raise
+        # Still up to date, so start a new TTL window
+        CACHE_FILE.touch()
+        return CACHE_FILE.read_bytes()
+
+    CACHE_DIR.mkdir(parents=True, exist_ok=True)
+    write_cache_file(CACHE_FILE, html)
+    write_cache_file(CACHE_HEADERS_FILE, json.dumps(response_headers).encode())
+    return html
+
+
+def get_official_tables():
+    """Fetches and parses the Bot API docs. Returns a dict mapping the name of each documented
+    method & type to the names of its parameters/fields.
+    """
+    from bs4 import BeautifulSoup, SoupStrainer
+
+    # We only ever look at the headings and the parameter tables, so skip building the rest of
+    # the DOM. Their children (the anchors, rows and cells) are kept anyway
+    strainer = SoupStrainer(['h4', 'table'])
+    soup = BeautifulSoup(fetch_bot_api_html(), 'lxml', parse_only=strainer)
+
+    # Pair every h4 with the first table following it (if any) before the next h4 in one pass
+    sections = []
+    for tag in soup.find_all(['h4', 'table']):
+        if tag.name == 'h4':
+            sections.append([tag, None])
+        elif sections and sections[-1][1] is None:
+            sections[-1][1] = tag
+
+    tables = {}
+    for h4, table in sections:
+        anchor = h4.find('a', class_='anchor', recursive=False)
+        # Methods and types don't have spaces in them, luckily all other sections of the docs do
+        # TODO: don't depend on that
+        if anchor is not None and '-' not in anchor['name']:
+            tables[h4.text] = parse_table(table)
+    return tables
+
+
+def collect_official_tests():
+    """Returns the arguments & ids for test_official. The docs are parsed only here, at
+    collection time, and the tests just receive plain strings. This keeps the parameters cheap to
+    hand around, e.g. when running the tests in parallel via pytest-xdist, and allows the parsed
+    document to be garbage collected.
+    """
+    argvalues = []
+    names = []
+    for name, parameters in get_official_tables().items():
         # Is it a method
-        if h4.text[0].lower() == h4.text[0]:
-            argvalues.append((check_method, h4))
-            names.append(h4.text)
-        elif h4.text not in IGNORED_OBJECTS:  # Or a type/object
-            argvalues.append((check_object, h4))
-            names.append(h4.text)
+        if name[0].lower() == name[0]:
+            argvalues.append(('method', name, parameters))
+            names.append(name)
+        elif name not in IGNORED_OBJECTS:  # Or a type/object
+            argvalues.append(('object', name, parameters))
+            names.append(name)
+    return argvalues, names
 
 
-@pytest.mark.parametrize(('method', 'data'), argvalues=argvalues, ids=names)
-@pytest.mark.skipif(
-    not env_var_2_bool(os.getenv('TEST_OFFICIAL')), reason='test_official is not enabled'
-)
-def test_official(method, data):
-    method(data)
+def pytest_generate_tests(metafunc):
+    argvalues, names = collect_official_tests()
+    metafunc.parametrize(('kind', 'name', 'parameters'), argvalues=argvalues, ids=names)
+
+
+def test_official(kind, name, parameters):
+    check_official(kind, name, parameters)
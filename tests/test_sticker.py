@@ -16,54 +16,180 @@
 #
 # You should have received a copy of the GNU Lesser Public License
 # along with this program.  If not, see [http://www.gnu.org/licenses/].
+import hashlib
 import os
+import random
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from io import BytesIO
 from pathlib import Path
-from time import sleep
+from time import monotonic, sleep
 
 import pytest
 from flaky import flaky
 
 from telegram import Sticker, PhotoSize, TelegramError, StickerSet, Audio, MaskPosition, Bot, File
-from telegram.error import BadRequest
-from tests.conftest import check_shortcut_call, check_shortcut_signature, check_defaults_handling
+from telegram.error import BadRequest, RetryAfter
+from tests.conftest import (
+    check_shortcut_call,
+    check_shortcut_signature,
+    check_defaults_handling,
+    env_var_2_bool,
+)
+
+LOCAL_FILE = 'tests/data/telegram.jpg'
+LOCAL_FILE_URI = (Path.cwd() / 'tests/data/telegram.jpg/').as_uri()
+
+if env_var_2_bool(os.getenv('PYTEST_WARM_CACHE', False)):
+    # Read all files used in this module once, so that later reads hit the OS page cache
+    for data_file in (
+        'tests/data/telegram.webp',
+        'tests/data/telegram_animated_sticker.tgs',
+        'tests/data/telegram_video_sticker.webm',
+        'tests/data/sticker_set_thumb.png',
+        'tests/data/telegram_sticker.png',
+        LOCAL_FILE,
+    ):
+        Path(data_file).read_bytes()
+
+
+def bytes_file(content, name):
+    """Returns a fresh file-like object of the content. The name is set, so that InputFile can
+    still guess the mime type.
+    """
+    file = BytesIO(content)
+    file.name = name
+    return file
+
+
+def assert_photo_size_echoes(actual, expected):
+    """Checks that a sent file got a fresh file id while the other attributes are the same as the
+    ones of the expected file.
+    """
+    assert isinstance(actual, PhotoSize)
+    assert isinstance(actual.file_id, str)
+    assert isinstance(actual.file_unique_id, str)
+    assert actual.file_id != ''
+    assert actual.file_unique_id != ''
+    assert actual.width == expected.width
+    assert actual.height == expected.height
+    assert actual.file_size == expected.file_size
+
+
+def assert_sticker_echoes(actual, expected):
+    """Like :func:`assert_photo_size_echoes`, but for stickers and their thumbnails."""
+    assert isinstance(actual, Sticker)
+    assert isinstance(actual.file_id, str)
+    assert isinstance(actual.file_unique_id, str)
+    assert actual.file_id != ''
+    assert actual.file_unique_id != ''
+    assert actual.width == expected.width
+    assert actual.height == expected.height
+    assert actual.is_animated == expected.is_animated
+    assert actual.is_video == expected.is_video
+    assert actual.file_size == expected.file_size
+    # we need to be a premium TG user to send a premium sticker, so the below is not tested
+    # assert actual.premium_animation == expected.premium_animation
+
+    assert_photo_size_echoes(actual.thumb, expected.thumb)
+
+
+# The equality tests only read the objects, so the same arguments can share one instance. Note
+# that tests checking `a is not b` must pass different arguments or build one of them directly.
+@lru_cache(maxsize=64)
+def _sticker(file_id, file_unique_id, width, height, is_animated, is_video):
+    return Sticker(file_id, file_unique_id, width, height, is_animated, is_video)
+
+
+@lru_cache(maxsize=64)
+def _sticker_set(name, title, is_animated, contains_masks, stickers, is_video):
+    # stickers is passed as tuple to be hashable
+    return StickerSet(
+        name, title, is_animated, contains_masks, list(stickers) if stickers else None, is_video
+    )
+
+
+@pytest.fixture(scope='session')
+def _sticker_bytes():
+    return Path('tests/data/telegram.webp').read_bytes()
 
 
 @pytest.fixture(scope='function')
-def sticker_file():
-    f = open('tests/data/telegram.webp', 'rb')
-    yield f
-    f.close()
+def sticker_file(_sticker_bytes):
+    return bytes_file(_sticker_bytes, 'telegram.webp')
 
 
-@pytest.fixture(scope='class')
-def sticker(bot, chat_id):
-    with open('tests/data/telegram.webp', 'rb') as f:
-        return bot.send_sticker(chat_id, sticker=f, timeout=50).sticker
+@pytest.fixture(scope='session')
+def _animated_sticker_bytes():
+    return Path('tests/data/telegram_animated_sticker.tgs').read_bytes()
 
 
 @pytest.fixture(scope='function')
-def animated_sticker_file():
-    f = open('tests/data/telegram_animated_sticker.tgs', 'rb')
-    yield f
-    f.close()
+def animated_sticker_file(_animated_sticker_bytes):
+    return bytes_file(_animated_sticker_bytes, 'telegram_animated_sticker.tgs')
 
 
-@pytest.fixture(scope='class')
-def animated_sticker(bot, chat_id):
-    with open('tests/data/telegram_animated_sticker.tgs', 'rb') as f:
-        return bot.send_sticker(chat_id, sticker=f, timeout=50).sticker
+@pytest.fixture(scope='session')
+def _video_sticker_bytes():
+    return Path('tests/data/telegram_video_sticker.webm').read_bytes()
+
+
+@pytest.fixture(scope='function')
+def video_sticker_file(_video_sticker_bytes):
+    return bytes_file(_video_sticker_bytes, 'telegram_video_sticker.webm')
+
+
+@pytest.fixture(scope='session')
+def _send_sticker(bot, chat_id, _sticker_bytes):
+    # The sticker is sent only once per session. Failed attempts are not cached, so that reruns
+    # of flaky tests can send it again, which a failed session fixture wouldn't allow
+    @lru_cache(maxsize=1)
+    def send_sticker():
+        sticker_file = bytes_file(_sticker_bytes, 'telegram.webp')
+        return bot.send_sticker(chat_id, sticker=sticker_file, timeout=50).sticker
+
+    return send_sticker
 
 
 @pytest.fixture(scope='function')
-def video_sticker_file():
-    with open('tests/data/telegram_video_sticker.webm', 'rb') as f:
-        yield f
+def sticker(_send_sticker):
+    return _send_sticker()
 
 
 @pytest.fixture(scope='class')
-def video_sticker(bot, chat_id):
-    with open('tests/data/telegram_video_sticker.webm', 'rb') as f:
-        return bot.send_sticker(chat_id, sticker=f, timeout=50).sticker
+def offline_sticker():
+    # A local stand-in for the uploaded sticker, for tests that don't need to talk to Telegram
+    return Sticker(
+        TestSticker.sticker_file_id,
+        TestSticker.sticker_file_unique_id,
+        TestSticker.width,
+        TestSticker.height,
+        TestSticker.is_animated,
+        TestSticker.is_video,
+        thumb=PhotoSize(
+            'thumb_file_id',
+            'thumb_file_unique_id',
+            TestSticker.thumb_width,
+            TestSticker.thumb_height,
+            file_size=TestSticker.thumb_file_size,
+        ),
+        emoji=TestSticker.emoji,
+        file_size=TestSticker.file_size,
+    )
+
+
+@pytest.fixture(scope='session')
+def flame_sticker_set(bot):
+    """Returns a function that fetches the Flame sticker set. The set is large and only read, so
+    it's fetched once per session. Failed fetches are not cached, so that reruns of flaky tests
+    fetch again.
+    """
+
+    @lru_cache(maxsize=1)
+    def get_flame_sticker_set():
+        return bot.get_sticker_set('Flame')
+
+    return get_flame_sticker_set
 
 
 class TestSticker:
@@ -89,7 +215,16 @@ class TestSticker:
 
     premium_animation = File("this_is_an_id", "this_is_an_unique_id")
 
-    def test_slot_behaviour(self, sticker, mro_slots, recwarn):
+    def test_slot_behaviour(self, mro_slots, recwarn):
+        # Not the shared sticker fixture, as this test sets attributes on the object
+        sticker = Sticker(
+            self.sticker_file_id,
+            self.sticker_file_unique_id,
+            self.width,
+            self.height,
+            self.is_animated,
+            self.is_video,
+        )
         for attr in sticker.__slots__:
             assert getattr(sticker, attr, 'err') != 'err', f"got extra slot '{attr}'"
         assert not sticker.__dict__, f"got missing slot(s): {sticker.__dict__}"
@@ -128,31 +263,11 @@ class TestSticker:
             chat_id, sticker=sticker_file, disable_notification=False, protect_content=True
         )
 
-        assert isinstance(message.sticker, Sticker)
-        assert isinstance(message.sticker.file_id, str)
-        assert isinstance(message.sticker.file_unique_id, str)
-        assert message.sticker.file_id != ''
-        assert message.sticker.file_unique_id != ''
-        assert message.sticker.width == sticker.width
-        assert message.sticker.height == sticker.height
-        assert message.sticker.is_animated == sticker.is_animated
-        assert message.sticker.is_video == sticker.is_video
-        assert message.sticker.file_size == sticker.file_size
-        # we need to be a premium TG user to send a premium sticker, so the below is not tested
-        # assert message.sticker.premium_animation == sticker.premium_animation
-
-        assert isinstance(message.sticker.thumb, PhotoSize)
-        assert isinstance(message.sticker.thumb.file_id, str)
-        assert isinstance(message.sticker.thumb.file_unique_id, str)
-        assert message.sticker.thumb.file_id != ''
-        assert message.sticker.thumb.file_unique_id != ''
-        assert message.sticker.thumb.width == sticker.thumb.width
-        assert message.sticker.thumb.height == sticker.thumb.height
-        assert message.sticker.thumb.file_size == sticker.thumb.file_size
+        assert_sticker_echoes(message.sticker, sticker)
         assert message.has_protected_content
 
     @flaky(3, 1)
-    def test_get_and_download(self, bot, sticker):
+    def test_get_and_download(self, bot, sticker, tmp_path):
         new_file = bot.get_file(sticker.file_id)
 
         assert new_file.file_size == sticker.file_size
@@ -160,9 +275,10 @@ class TestSticker:
         assert new_file.file_unique_id == sticker.file_unique_id
         assert new_file.file_path.startswith('https://')
 
-        new_file.download('telegram.webp')
+        path = tmp_path / 'telegram.webp'
+        new_file.download(str(path))
 
-        assert os.path.isfile('telegram.webp')
+        assert path.is_file()
 
     @flaky(3, 1)
     def test_resend(self, bot, chat_id, sticker):
@@ -178,31 +294,15 @@ class TestSticker:
         assert sticker.emoji == self.emoji
 
     @flaky(3, 1)
-    def test_send_from_url(self, bot, chat_id):
+    def test_send_from_url(self, bot, chat_id, sticker):
         message = bot.send_sticker(chat_id=chat_id, sticker=self.sticker_file_url)
-        sticker = message.sticker
 
-        assert isinstance(message.sticker, Sticker)
-        assert isinstance(message.sticker.file_id, str)
-        assert isinstance(message.sticker.file_unique_id, str)
-        assert message.sticker.file_id != ''
-        assert message.sticker.file_unique_id != ''
-        assert message.sticker.width == sticker.width
-        assert message.sticker.height == sticker.height
-        assert message.sticker.is_animated == sticker.is_animated
-        assert message.sticker.is_video == sticker.is_video
-        assert message.sticker.file_size == sticker.file_size
-
-        assert isinstance(message.sticker.thumb, PhotoSize)
-        assert isinstance(message.sticker.thumb.file_id, str)
-        assert isinstance(message.sticker.thumb.file_unique_id, str)
-        assert message.sticker.thumb.file_id != ''
-        assert message.sticker.thumb.file_unique_id != ''
-        assert message.sticker.thumb.width == sticker.thumb.width
-        assert message.sticker.thumb.height == sticker.thumb.height
-        assert message.sticker.thumb.file_size == sticker.thumb.file_size
-
-    def test_de_json(self, bot, sticker):
+        # The url serves the same file as the one of the sticker fixture
+        assert_sticker_echoes(message.sticker, sticker)
+
+    def test_de_json(self, bot, offline_sticker):
+        thumb_dict = offline_sticker.thumb.to_dict()
+        premium_animation_dict = self.premium_animation.to_dict()
         json_dict = {
             'file_id': self.sticker_file_id,
             'file_unique_id': self.sticker_file_unique_id,
@@ -210,10 +310,10 @@ class TestSticker:
             'height': self.height,
             'is_animated': self.is_animated,
             'is_video': self.is_video,
-            'thumb': sticker.thumb.to_dict(),
+            'thumb': thumb_dict,
             'emoji': self.emoji,
             'file_size': self.file_size,
-            'premium_animation': self.premium_animation.to_dict(),
+            'premium_animation': premium_animation_dict,
         }
         json_sticker = Sticker.de_json(json_dict, bot)
 
@@ -225,7 +325,7 @@ class TestSticker:
         assert json_sticker.is_video == self.is_video
         assert json_sticker.emoji == self.emoji
         assert json_sticker.file_size == self.file_size
-        assert json_sticker.thumb == sticker.thumb
+        assert json_sticker.thumb == offline_sticker.thumb
         assert json_sticker.premium_animation == self.premium_animation
 
     def test_send_with_sticker(self, monkeypatch, bot, chat_id, sticker):
@@ -236,18 +336,56 @@ class TestSticker:
         message = bot.send_sticker(sticker=sticker, chat_id=chat_id)
         assert message
 
-    def test_send_sticker_local_files(self, monkeypatch, bot, chat_id):
+    @pytest.mark.parametrize(
+        'method,user_arg,kwargs',
+        [
+            ('send_sticker', 'chat_id', {'sticker': LOCAL_FILE}),
+            ('upload_sticker_file', 'user_id', {'png_sticker': LOCAL_FILE}),
+            (
+                'create_new_sticker_set',
+                'user_id',
+                {
+                    'name': 'name',
+                    'title': 'title',
+                    'emojis': 'emoji',
+                    'png_sticker': LOCAL_FILE,
+                    'tgs_sticker': LOCAL_FILE,
+                    'webm_sticker': LOCAL_FILE,
+                },
+            ),
+            (
+                'add_sticker_to_set',
+                'user_id',
+                {
+                    'name': 'name',
+                    'emojis': 'emoji',
+                    'png_sticker': LOCAL_FILE,
+                    'tgs_sticker': LOCAL_FILE,
+                },
+            ),
+            ('set_sticker_set_thumb', 'user_id', {'name': 'name', 'thumb': LOCAL_FILE}),
+        ],
+        ids=[
+            'send_sticker',
+            'upload_sticker_file',
+            'create_new_sticker_set',
+            'add_sticker_to_set',
+            'set_sticker_set_thumb',
+        ],
+    )
+    def test_local_files(self, monkeypatch, bot, chat_id, method, user_arg, kwargs):
         # For just test that the correct paths are passed as we have no local bot API set up
         test_flag = False
-        expected = (Path.cwd() / 'tests/data/telegram.jpg/').as_uri()
-        file = 'tests/data/telegram.jpg'
+        expected_kwargs = {
+            key: LOCAL_FILE_URI for key, value in kwargs.items() if value == LOCAL_FILE
+        }
 
-        def make_assertion(_, data, *args, **kwargs):
+        def make_assertion(_, data, *args, **post_kwargs):
             nonlocal test_flag
-            test_flag = data.get('sticker') == expected
+            test_flag = expected_kwargs.items() <= data.items()
 
         monkeypatch.setattr(bot, '_post', make_assertion)
-        bot.send_sticker(chat_id, file)
+        getattr(bot, method)(**{user_arg: chat_id}, **kwargs)
         assert test_flag
         monkeypatch.delattr(bot, '_post')
 
@@ -285,23 +423,29 @@ class TestSticker:
                     chat_id, sticker, reply_to_message_id=reply_to_message.message_id
                 )
 
-    def test_to_dict(self, sticker):
-        sticker_dict = sticker.to_dict()
+    def test_to_dict(self, offline_sticker):
+        sticker_dict = offline_sticker.to_dict()
 
         assert isinstance(sticker_dict, dict)
-        assert sticker_dict['file_id'] == sticker.file_id
-        assert sticker_dict['file_unique_id'] == sticker.file_unique_id
-        assert sticker_dict['width'] == sticker.width
-        assert sticker_dict['height'] == sticker.height
-        assert sticker_dict['is_animated'] == sticker.is_animated
-        assert sticker_dict['is_video'] == sticker.is_video
-        assert sticker_dict['file_size'] == sticker.file_size
-        assert sticker_dict['thumb'] == sticker.thumb.to_dict()
-
-    @flaky(3, 1)
-    def test_error_send_empty_file(self, bot, chat_id):
-        with pytest.raises(TelegramError):
-            bot.send_sticker(chat_id, open(os.devnull, 'rb'))
+        assert sticker_dict['file_id'] == offline_sticker.file_id
+        assert sticker_dict['file_unique_id'] == offline_sticker.file_unique_id
+        assert sticker_dict['width'] == offline_sticker.width
+        assert sticker_dict['height'] == offline_sticker.height
+        assert sticker_dict['is_animated'] == offline_sticker.is_animated
+        assert sticker_dict['is_video'] == offline_sticker.is_video
+        assert sticker_dict['file_size'] == offline_sticker.file_size
+        assert sticker_dict['thumb'] == offline_sticker.thumb.to_dict()
+
+    def test_error_send_empty_file(self, monkeypatch, bot, chat_id):
+        # No need to bother Telegram with this, we only check that the error is passed through
+        def make_assertion(url, data, *args, **kwargs):
+            if not data['sticker'].input_file_content:
+                raise TelegramError('File must be non-empty')
+            return False
+
+        monkeypatch.setattr(bot.request, 'post', make_assertion)
+        with pytest.raises(TelegramError, match='File must be non-empty'):
+            bot.send_sticker(chat_id, bytes_file(b'', 'telegram.webp'))
 
     @flaky(3, 1)
     def test_error_send_empty_file_id(self, bot, chat_id):
@@ -313,13 +457,12 @@ class TestSticker:
             bot.send_sticker(chat_id)
 
     @flaky(3, 1)
-    def test_premium_animation(self, bot):
+    def test_premium_animation(self, flame_sticker_set):
         # testing animation sucks a bit since we can't create a premium sticker. What we can do is
         # get a sticker set which includes a premium sticker and check that specific one.
-        premium_sticker_set = bot.get_sticker_set("Flame")
         # the first one to appear here is a sticker with unique file id of AQADOBwAAifPOElr
         # this could change in the future ofc.
-        premium_sticker = premium_sticker_set.stickers[20]
+        premium_sticker = flame_sticker_set().stickers[20]
         assert premium_sticker.premium_animation.file_unique_id == "AQADOBwAAifPOElr"
         assert isinstance(premium_sticker.premium_animation.file_id, str)
         assert premium_sticker.premium_animation.file_id != ""
@@ -330,22 +473,31 @@ class TestSticker:
         }
         assert premium_sticker.premium_animation.to_dict() == premium_sticker_dict
 
-    def test_equality(self, sticker):
-        a = Sticker(
-            sticker.file_id,
-            sticker.file_unique_id,
+    def test_equality(self, offline_sticker):
+        a = _sticker(
+            offline_sticker.file_id,
+            offline_sticker.file_unique_id,
             self.width,
             self.height,
             self.is_animated,
             self.is_video,
         )
-        b = Sticker(
-            '', sticker.file_unique_id, self.width, self.height, self.is_animated, self.is_video
+        b = _sticker(
+            '',
+            offline_sticker.file_unique_id,
+            self.width,
+            self.height,
+            self.is_animated,
+            self.is_video,
         )
-        c = Sticker(sticker.file_id, sticker.file_unique_id, 0, 0, False, True)
-        d = Sticker('', '', self.width, self.height, self.is_animated, self.is_video)
+        c = _sticker(offline_sticker.file_id, offline_sticker.file_unique_id, 0, 0, False, True)
+        d = _sticker('', '', self.width, self.height, self.is_animated, self.is_video)
         e = PhotoSize(
-            sticker.file_id, sticker.file_unique_id, self.width, self.height, self.is_animated
+            offline_sticker.file_id,
+            offline_sticker.file_unique_id,
+            self.width,
+            self.height,
+            self.is_animated,
         )
 
         assert a == b
@@ -362,55 +514,125 @@ class TestSticker:
         assert hash(a) != hash(e)
 
 
-@pytest.fixture(scope='function')
-def sticker_set(bot):
-    ss = bot.get_sticker_set(f'test_by_{bot.username}')
-    if len(ss.stickers) > 100:
+def delete_last_stickers(bot, sticker_set, count=49):
+    # The requests are independent, so send them concurrently instead of waiting for each one.
+    # Sticker set mutations are flood limited, so only a few run at once
+    def delete(file_id):
         try:
-            for i in range(1, 50):
-                bot.delete_sticker_from_set(ss.stickers[-i].file_id)
-        except BadRequest as e:
-            if e.message == 'Stickerset_not_modified':
-                return ss
-            raise Exception('stickerset is growing too large.')
-    return ss
+            return bot.delete_sticker_from_set(file_id)
+        except RetryAfter as e:
+            # Retry once after short flood waits, but fail fast on long ones. The jitter keeps the
+            # workers from sending their retries at the same moment
+            if e.retry_after > 30:
+                raise
+            sleep(e.retry_after + random.uniform(0, 1))
+            return bot.delete_sticker_from_set(file_id)
+
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        futures = [executor.submit(delete, s.file_id) for s in sticker_set.stickers[-count:]]
+    for future in futures:
+        future.result()  # re-raises errors, e.g. BadRequest
+
+
+class RateLimiter:
+    """Ensures that at least ``period`` seconds pass between two calls of :meth:`acquire`. Only
+    blocks for the remainder of the period, so time already spent on e.g. network requests counts.
+    """
+
+    def __init__(self, period=1.0):
+        self.period = period
+        self._last_call = float('-inf')
+
+    def acquire(self):
+        remaining = self._last_call + self.period - monotonic()
+        if remaining > 0:
+            sleep(remaining)
+        self._last_call = monotonic()
+
+
+@pytest.fixture(scope='session')
+def _sticker_set_rate_limiter():
+    # Shared by all tests that modify the sticker sets, which are prone to being flood limited
+    return RateLimiter(period=1.0)
 
 
 @pytest.fixture(scope='function')
-def animated_sticker_set(bot):
-    ss = bot.get_sticker_set(f'animated_test_by_{bot.username}')
-    if len(ss.stickers) > 100:
-        try:
-            for i in range(1, 50):
-                bot.delete_sticker_from_set(ss.stickers[-i].file_id)
-        except BadRequest as e:
-            if e.message == 'Stickerset_not_modified':
-                return ss
-            raise Exception('stickerset is growing too large.')
-    return ss
+def sticker_set_factory(bot):
+    """Returns a function that fetches the test sticker set with the given prefix, e.g.
+    ``'animated_'``, and trims it if it grew too large.
+    """
+
+    def make_sticker_set(prefix=''):
+        ss = bot.get_sticker_set(f'{prefix}test_by_{bot.username}')
+        if len(ss.stickers) > 100:
+            try:
+                delete_last_stickers(bot, ss)
+            except BadRequest as e:
+                if e.message == 'Stickerset_not_modified':
+                    return ss
+                raise Exception('stickerset is growing too large.')
+        return ss
+
+    return make_sticker_set
 
 
 @pytest.fixture(scope='function')
-def video_sticker_set(bot):
-    ss = bot.get_sticker_set(f'video_test_by_{bot.username}')
-    if len(ss.stickers) > 100:
-        try:
-            for i in range(1, 50):
-                bot.delete_sticker_from_set(ss.stickers[-i].file_id)
-        except BadRequest as e:
-            if e.message == 'Stickerset_not_modified':
-                return ss
-            raise Exception('stickerset is growing too large.')
-    return ss
+def sticker_set(sticker_set_factory):
+    return sticker_set_factory()
 
 
 @pytest.fixture(scope='function')
-def sticker_set_thumb_file():
-    f = open('tests/data/sticker_set_thumb.png', 'rb')
-    yield f
-    f.close()
+def animated_sticker_set(sticker_set_factory):
+    return sticker_set_factory('animated_')
+
+
+@pytest.fixture(scope='function')
+def video_sticker_set(sticker_set_factory):
+    return sticker_set_factory('video_')
+
+
+@pytest.fixture(scope='session')
+def png_sticker_file_id(request, bot, chat_id):
+    """Returns a function that returns the file_id of the uploaded telegram_sticker.png.
+
+    Uploading the same file over and over again is pointless, so the file_id is stored in the
+    pytest cache. file_ids are bot specific, so the bot's id is part of the key. Pass
+    ``refresh=True`` to drop the cached file_id and upload the file again, e.g. because the cached
+    one went stale.
+    """
+    content = Path('tests/data/telegram_sticker.png').read_bytes()
+    digest = hashlib.sha256(content).hexdigest()
+    key = f'ptb/uploaded_sticker_file_id/{bot.id}/{digest}'
+
+    def get_file_id(refresh=False):
+        if refresh:
+            request.config.cache.set(key, None)
+        file_id = request.config.cache.get(key, None)
+        if file_id is None:
+            # chat_id was hardcoded as 95205500 but it stopped working for some reason
+            file = bot.upload_sticker_file(chat_id, bytes_file(content, 'telegram_sticker.png'))
+            assert isinstance(file, File)
+            assert file.file_id
+            file_id = file.file_id
+            request.config.cache.set(key, file_id)
+        return file_id
+
+    return get_file_id
 
 
+@pytest.fixture(scope='session')
+def _sticker_set_thumb_bytes():
+    return Path('tests/data/sticker_set_thumb.png').read_bytes()
+
+
+@pytest.fixture(scope='function')
+def sticker_set_thumb_file(_sticker_set_thumb_bytes):
+    return bytes_file(_sticker_set_thumb_bytes, 'sticker_set_thumb.png')
+
+
+# The tests modify the same sticker sets in a specific order, so when running tests in parallel
+# with pytest-xdist, they must all run on the same worker
+@pytest.mark.xdist_group('stickerset')
 class TestStickerSet:
     title = 'Test stickers'
     is_animated = True
@@ -419,26 +641,25 @@ class TestStickerSet:
     stickers = [Sticker('file_id', 'file_un_id', 512, 512, True, True)]
     name = 'NOTAREALNAME'
 
-    def test_de_json(self, bot, sticker):
-        name = f'test_by_{bot.username}'
+    def test_de_json(self, bot, offline_sticker):
         json_dict = {
-            'name': name,
+            'name': self.name,
             'title': self.title,
             'is_animated': self.is_animated,
             'is_video': self.is_video,
             'contains_masks': self.contains_masks,
             'stickers': [x.to_dict() for x in self.stickers],
-            'thumb': sticker.thumb.to_dict(),
+            'thumb': offline_sticker.thumb.to_dict(),
         }
         sticker_set = StickerSet.de_json(json_dict, bot)
 
-        assert sticker_set.name == name
+        assert sticker_set.name == self.name
         assert sticker_set.title == self.title
         assert sticker_set.is_animated == self.is_animated
         assert sticker_set.is_video == self.is_video
         assert sticker_set.contains_masks == self.contains_masks
         assert sticker_set.stickers == self.stickers
-        assert sticker_set.thumb == sticker.thumb
+        assert sticker_set.thumb == offline_sticker.thumb
 
     def test_create_sticker_set(
         self, bot, chat_id, sticker_file, animated_sticker_file, video_sticker_file
@@ -483,14 +704,31 @@ class TestStickerSet:
                     assert v
 
     @flaky(3, 1)
-    def test_bot_methods_1_png(self, bot, chat_id, sticker_file):
+    def test_upload_sticker_file(self, bot, chat_id):
+        # Always uploads, unlike png_sticker_file_id which reuses the file_id of earlier runs
         with open('tests/data/telegram_sticker.png', 'rb') as f:
-            # chat_id was hardcoded as 95205500 but it stopped working for some reason
             file = bot.upload_sticker_file(chat_id, f)
-        assert file
-        assert bot.add_sticker_to_set(
-            chat_id, f'test_by_{bot.username}', png_sticker=file.file_id, emojis='😄'
-        )
+        assert isinstance(file, File)
+        assert file.file_id
+        assert file.file_unique_id
+
+    @flaky(3, 1)
+    def test_bot_methods_1_png(self, bot, chat_id, sticker_file, png_sticker_file_id):
+        try:
+            added = bot.add_sticker_to_set(
+                chat_id, f'test_by_{bot.username}', png_sticker=png_sticker_file_id(), emojis='😄'
+            )
+        except BadRequest as e:
+            # Only a stale cached file_id is worth another upload, anything else is a real failure
+            if 'file identifier' not in e.message.lower():
+                raise
+            added = bot.add_sticker_to_set(
+                chat_id,
+                f'test_by_{bot.username}',
+                png_sticker=png_sticker_file_id(refresh=True),
+                emojis='😄',
+            )
+        assert added
         # Also test with file input and mask
         assert bot.add_sticker_to_set(
             chat_id,
@@ -518,6 +756,7 @@ class TestStickerSet:
 
     def test_sticker_set_to_dict(self, sticker_set):
         sticker_set_dict = sticker_set.to_dict()
+        first_sticker_dict = sticker_set.stickers[0].to_dict()
 
         assert isinstance(sticker_set_dict, dict)
         assert sticker_set_dict['name'] == sticker_set.name
@@ -525,7 +764,7 @@ class TestStickerSet:
         assert sticker_set_dict['is_animated'] == sticker_set.is_animated
         assert sticker_set_dict['is_video'] == sticker_set.is_video
         assert sticker_set_dict['contains_masks'] == sticker_set.contains_masks
-        assert sticker_set_dict['stickers'][0] == sticker_set.stickers[0].to_dict()
+        assert sticker_set_dict['stickers'][0] == first_sticker_dict
 
     @flaky(3, 1)
     def test_bot_methods_2_png(self, bot, sticker_set):
@@ -543,15 +782,19 @@ class TestStickerSet:
         assert bot.set_sticker_position_in_set(file_id, 1)
 
     @flaky(10, 1)
-    def test_bot_methods_3_png(self, bot, chat_id, sticker_set_thumb_file):
-        sleep(1)
+    def test_bot_methods_3_png(
+        self, bot, chat_id, sticker_set_thumb_file, _sticker_set_rate_limiter
+    ):
+        _sticker_set_rate_limiter.acquire()
         assert bot.set_sticker_set_thumb(
             f'test_by_{bot.username}', chat_id, sticker_set_thumb_file
         )
 
     @flaky(10, 1)
-    def test_bot_methods_3_tgs(self, bot, chat_id, animated_sticker_file, animated_sticker_set):
-        sleep(1)
+    def test_bot_methods_3_tgs(
+        self, bot, chat_id, animated_sticker_file, animated_sticker_set, _sticker_set_rate_limiter
+    ):
+        _sticker_set_rate_limiter.acquire()
         animated_test = f'animated_test_by_{bot.username}'
         assert bot.set_sticker_set_thumb(animated_test, chat_id, animated_sticker_file)
         file_id = animated_sticker_set.stickers[-1].file_id
@@ -567,95 +810,23 @@ class TestStickerSet:
         pass
 
     @flaky(10, 1)
-    def test_bot_methods_4_png(self, bot, sticker_set):
-        sleep(1)
+    def test_bot_methods_4_png(self, bot, sticker_set, _sticker_set_rate_limiter):
+        _sticker_set_rate_limiter.acquire()
         file_id = sticker_set.stickers[-1].file_id
         assert bot.delete_sticker_from_set(file_id)
 
     @flaky(10, 1)
-    def test_bot_methods_4_tgs(self, bot, animated_sticker_set):
-        sleep(1)
+    def test_bot_methods_4_tgs(self, bot, animated_sticker_set, _sticker_set_rate_limiter):
+        _sticker_set_rate_limiter.acquire()
         file_id = animated_sticker_set.stickers[-1].file_id
         assert bot.delete_sticker_from_set(file_id)
 
     @flaky(10, 1)
-    def test_bot_methods_4_webm(self, bot, video_sticker_set):
-        sleep(1)
+    def test_bot_methods_4_webm(self, bot, video_sticker_set, _sticker_set_rate_limiter):
+        _sticker_set_rate_limiter.acquire()
         file_id = video_sticker_set.stickers[-1].file_id
         assert bot.delete_sticker_from_set(file_id)
 
-    def test_upload_sticker_file_local_files(self, monkeypatch, bot, chat_id):
-        # For just test that the correct paths are passed as we have no local bot API set up
-        test_flag = False
-        expected = (Path.cwd() / 'tests/data/telegram.jpg/').as_uri()
-        file = 'tests/data/telegram.jpg'
-
-        def make_assertion(_, data, *args, **kwargs):
-            nonlocal test_flag
-            test_flag = data.get('png_sticker') == expected
-
-        monkeypatch.setattr(bot, '_post', make_assertion)
-        bot.upload_sticker_file(chat_id, file)
-        assert test_flag
-        monkeypatch.delattr(bot, '_post')
-
-    def test_create_new_sticker_set_local_files(self, monkeypatch, bot, chat_id):
-        # For just test that the correct paths are passed as we have no local bot API set up
-        test_flag = False
-        expected = (Path.cwd() / 'tests/data/telegram.jpg/').as_uri()
-        file = 'tests/data/telegram.jpg'
-
-        def make_assertion(_, data, *args, **kwargs):
-            nonlocal test_flag
-            test_flag = (
-                data.get('png_sticker') == expected
-                and data.get('tgs_sticker') == expected
-                and data.get('webm_sticker') == expected
-            )
-
-        monkeypatch.setattr(bot, '_post', make_assertion)
-        bot.create_new_sticker_set(
-            chat_id,
-            'name',
-            'title',
-            'emoji',
-            png_sticker=file,
-            tgs_sticker=file,
-            webm_sticker=file,
-        )
-        assert test_flag
-        monkeypatch.delattr(bot, '_post')
-
-    def test_add_sticker_to_set_local_files(self, monkeypatch, bot, chat_id):
-        # For just test that the correct paths are passed as we have no local bot API set up
-        test_flag = False
-        expected = (Path.cwd() / 'tests/data/telegram.jpg/').as_uri()
-        file = 'tests/data/telegram.jpg'
-
-        def make_assertion(_, data, *args, **kwargs):
-            nonlocal test_flag
-            test_flag = data.get('png_sticker') == expected and data.get('tgs_sticker') == expected
-
-        monkeypatch.setattr(bot, '_post', make_assertion)
-        bot.add_sticker_to_set(chat_id, 'name', 'emoji', png_sticker=file, tgs_sticker=file)
-        assert test_flag
-        monkeypatch.delattr(bot, '_post')
-
-    def test_set_sticker_set_thumb_local_files(self, monkeypatch, bot, chat_id):
-        # For just test that the correct paths are passed as we have no local bot API set up
-        test_flag = False
-        expected = (Path.cwd() / 'tests/data/telegram.jpg/').as_uri()
-        file = 'tests/data/telegram.jpg'
-
-        def make_assertion(_, data, *args, **kwargs):
-            nonlocal test_flag
-            test_flag = data.get('thumb') == expected
-
-        monkeypatch.setattr(bot, '_post', make_assertion)
-        bot.set_sticker_set_thumb('name', chat_id, thumb=file)
-        assert test_flag
-        monkeypatch.delattr(bot, '_post')
-
     def test_get_file_instance_method(self, monkeypatch, sticker):
         def make_assertion(*_, **kwargs):
             return kwargs['file_id'] == sticker.file_id
@@ -668,14 +839,15 @@ class TestStickerSet:
         assert sticker.get_file()
 
     def test_equality(self):
-        a = StickerSet(
+        a = _sticker_set(
             self.name,
             self.title,
             self.is_animated,
             self.contains_masks,
-            self.stickers,
+            tuple(self.stickers),
             self.is_video,
         )
+        # Not cached, as the same arguments would return the same object as for a
         b = StickerSet(
             self.name,
             self.title,
@@ -684,9 +856,14 @@ class TestStickerSet:
             self.stickers,
             self.is_video,
         )
-        c = StickerSet(self.name, None, None, None, None, None)
-        d = StickerSet(
-            'blah', self.title, self.is_animated, self.contains_masks, self.stickers, self.is_video
+        c = _sticker_set(self.name, None, None, None, None, None)
+        d = _sticker_set(
+            'blah',
+            self.title,
+            self.is_animated,
+            self.contains_masks,
+            tuple(self.stickers),
+            self.is_video,
         )
         e = Audio(self.name, '', 0, None, None)
 
@@ -28,27 +28,66 @@ from telegram import (
 )
 from telegram.utils.helpers import to_timestamp
 
+_NOW = dtm.datetime.utcnow()
+_NOW_PLUS_5 = _NOW + dtm.timedelta(seconds=5)
 
-@pytest.fixture(scope='class')
+
+@pytest.fixture(scope='session')
 def user1():
     return User(first_name='Misses Test', id=123, is_bot=False)
 
 
-@pytest.fixture(scope='class')
+@pytest.fixture(scope='session')
 def user2():
     return User(first_name='Mister Test', id=124, is_bot=False)
 
 
-class TestVideoChatStarted:
-    def test_slot_behaviour(self, recwarn, mro_slots):
-        action = VideoChatStarted()
-        for attr in action.__slots__:
-            assert getattr(action, attr, 'err') != 'err', f"got extra slot '{attr}'"
-        assert not action.__dict__, f"got missing slot(s): {action.__dict__}"
-        assert len(mro_slots(action)) == len(set(mro_slots(action))), "duplicate slot"
-        action.custom = 'should give warning'
-        assert len(recwarn) == 1 and 'custom' in str(recwarn[0].message), recwarn.list
+@pytest.fixture(scope='session')
+def user1_dict(user1):
+    return user1.to_dict()
+
+
+@pytest.fixture(scope='session')
+def user2_dict(user2):
+    return user2.to_dict()
+
+
+@pytest.fixture(scope='session')
+def invited_user1(user1):
+    return VideoChatParticipantsInvited([user1])
+
+
+@pytest.fixture(scope='session')
+def invited_user1_dup(user1):
+    # Equal to invited_user1, but a different object
+    return VideoChatParticipantsInvited([user1])
+
+
+@pytest.fixture(scope='session')
+def invited_user1_user2(user1, user2):
+    return VideoChatParticipantsInvited([user1, user2])
+
+
+@pytest.fixture(scope='session')
+def invited_user2(user2):
+    return VideoChatParticipantsInvited([user2])
+
 
+@pytest.fixture(scope='session')
+def started():
+    return VideoChatStarted()
+
+
+def _assert_slots(action, recwarn, mro_slots):
+    extra_slots = [attr for attr in action.__slots__ if not hasattr(action, attr)]
+    assert not extra_slots, f"got extra slot(s): {extra_slots}"
+    assert not vars(action), f"got missing slot(s): {vars(action)}"
+    assert len(mro_slots(action)) == len(set(mro_slots(action))), "duplicate slot"
+    action.custom = 'should give warning'
+    assert len(recwarn) == 1 and 'custom' in str(recwarn[0].message), recwarn.list
+
+
+class TestVideoChatStarted:
     def test_de_json(self):
         video_chat_started = VideoChatStarted.de_json({}, None)
         assert isinstance(video_chat_started, VideoChatStarted)
@@ -62,15 +101,6 @@ class TestVideoChatStarted:
 class TestVideoChatEnded:
     duration = 100
 
-    def test_slot_behaviour(self, recwarn, mro_slots):
-        action = VideoChatEnded(8)
-        for attr in action.__slots__:
-            assert getattr(action, attr, 'err') != 'err', f"got extra slot '{attr}'"
-        assert not action.__dict__, f"got missing slot(s): {action.__dict__}"
-        assert len(mro_slots(action)) == len(set(mro_slots(action))), "duplicate slot"
-        action.custom = 'should give warning'
-        assert len(recwarn) == 1 and 'custom' in str(recwarn[0].message), recwarn.list
-
     def test_de_json(self):
         json_dict = {'duration': self.duration}
         video_chat_ended = VideoChatEnded.de_json(json_dict, None)
@@ -84,34 +114,24 @@ class TestVideoChatEnded:
         assert isinstance(video_chat_dict, dict)
         assert video_chat_dict["duration"] == self.duration
 
-    def test_equality(self):
+    def test_equality(self, started):
         a = VideoChatEnded(100)
         b = VideoChatEnded(100)
         c = VideoChatEnded(50)
-        d = VideoChatStarted()
+        d = started
+        hash_a = hash(a)
 
         assert a == b
-        assert hash(a) == hash(b)
+        assert hash_a == hash(b)
 
-        assert a != c
-        assert hash(a) != hash(c)
-
-        assert a != d
-        assert hash(a) != hash(d)
+        others = (c, d)
+        assert a not in others
+        assert hash_a not in {hash(other) for other in others}
 
 
 class TestVideoChatParticipantsInvited:
-    def test_slot_behaviour(self, recwarn, mro_slots):
-        action = VideoChatParticipantsInvited([user1])
-        for attr in action.__slots__:
-            assert getattr(action, attr, 'err') != 'err', f"got extra slot '{attr}'"
-        assert not action.__dict__, f"got missing slot(s): {action.__dict__}"
-        assert len(mro_slots(action)) == len(set(mro_slots(action))), "duplicate slot"
-        action.custom = 'should give warning'
-        assert len(recwarn) == 1 and 'custom' in str(recwarn[0].message), recwarn.list
-
-    def test_de_json(self, user1, user2, bot):
-        json_data = {"users": [user1.to_dict(), user2.to_dict()]}
+    def test_de_json(self, user1, user2, user1_dict, user2_dict, bot):
+        json_data = {"users": [user1_dict, user2_dict]}
         video_chat_participants = VideoChatParticipantsInvited.de_json(json_data, bot)
 
         assert isinstance(video_chat_participants.users, list)
@@ -120,76 +140,91 @@ class TestVideoChatParticipantsInvited:
         assert video_chat_participants.users[0].id == user1.id
         assert video_chat_participants.users[1].id == user2.id
 
-    def test_to_dict(self, user1, user2):
+    def test_to_dict(self, user1, user2, user1_dict, user2_dict):
         video_chat_participants = VideoChatParticipantsInvited([user1, user2])
         video_chat_dict = video_chat_participants.to_dict()
 
         assert isinstance(video_chat_dict, dict)
-        assert video_chat_dict["users"] == [user1.to_dict(), user2.to_dict()]
+        assert video_chat_dict["users"] == [user1_dict, user2_dict]
         assert video_chat_dict["users"][0]["id"] == user1.id
         assert video_chat_dict["users"][1]["id"] == user2.id
 
-    def test_equality(self, user1, user2):
-        a = VideoChatParticipantsInvited([user1])
-        b = VideoChatParticipantsInvited([user1])
-        c = VideoChatParticipantsInvited([user1, user2])
-        d = VideoChatParticipantsInvited([user2])
-        e = VideoChatStarted()
+    def test_equality(
+        self, invited_user1, invited_user1_dup, invited_user1_user2, invited_user2, started
+    ):
+        a = invited_user1
+        b = invited_user1_dup
+        c = invited_user1_user2
+        d = invited_user2
+        e = started
+        hash_a = hash(a)
 
         assert a == b
-        assert hash(a) == hash(b)
-
-        assert a != c
-        assert hash(a) != hash(c)
-
-        assert a != d
-        assert hash(a) != hash(d)
+        assert hash_a == hash(b)
 
-        assert a != e
-        assert hash(a) != hash(e)
+        others = (c, d, e)
+        assert a not in others
+        assert hash_a not in {hash(other) for other in others}
 
 
 class TestVideoChatScheduled:
-    start_date = dtm.datetime.utcnow()
-
-    def test_slot_behaviour(self, recwarn, mro_slots):
-        inst = VideoChatScheduled(self.start_date)
-        for attr in inst.__slots__:
-            assert getattr(inst, attr, 'err') != 'err', f"got extra slot '{attr}'"
-        assert not inst.__dict__, f"got missing slot(s): {inst.__dict__}"
-        assert len(mro_slots(inst)) == len(set(mro_slots(inst))), "duplicate slot"
-        inst.custom, inst.start_date = 'should give warning', self.start_date
-        assert len(recwarn) == 1 and 'custom' in str(recwarn[0].message), recwarn.list
+    start_date = _NOW
+    start_ts = to_timestamp(start_date)
 
     def test_expected_values(self):
-        assert pytest.approx(VideoChatScheduled(start_date=self.start_date) == self.start_date)
+        assert VideoChatScheduled(start_date=self.start_date).start_date == self.start_date
 
     def test_de_json(self, bot):
         assert VideoChatScheduled.de_json({}, bot=bot) is None
 
-        json_dict = {'start_date': to_timestamp(self.start_date)}
+        json_dict = {'start_date': self.start_ts}
         video_chat_scheduled = VideoChatScheduled.de_json(json_dict, bot)
 
-        assert pytest.approx(video_chat_scheduled.start_date == self.start_date)
+        # The timestamp has no sub-second precision and de_json returns an aware datetime
+        start_date = self.start_date.replace(tzinfo=dtm.timezone.utc)
+        assert abs(video_chat_scheduled.start_date - start_date) < dtm.timedelta(seconds=1)
 
     def test_to_dict(self):
         video_chat_scheduled = VideoChatScheduled(self.start_date)
         video_chat_scheduled_dict = video_chat_scheduled.to_dict()
 
         assert isinstance(video_chat_scheduled_dict, dict)
-        assert video_chat_scheduled_dict["start_date"] == to_timestamp(self.start_date)
+        assert video_chat_scheduled_dict["start_date"] == self.start_ts
 
-    def test_equality(self):
+    def test_equality(self, started):
         a = VideoChatScheduled(self.start_date)
         b = VideoChatScheduled(self.start_date)
-        c = VideoChatScheduled(dtm.datetime.utcnow() + dtm.timedelta(seconds=5))
-        d = VideoChatStarted()
+        c = VideoChatScheduled(_NOW_PLUS_5)
+        d = started
+        hash_a = hash(a)
 
         assert a == b
-        assert hash(a) == hash(b)
+        assert hash_a == hash(b)
+
+        others = (c, d)
+        assert a not in others
+        assert hash_a not in {hash(other) for other in others}
 
-        assert a != c
-        assert hash(a) != hash(c)
 
-        assert a != d
-        assert hash(a) != hash(d)
+@pytest.fixture(
+    params=[VideoChatStarted, VideoChatEnded, VideoChatParticipantsInvited, VideoChatScheduled],
+    ids=lambda cls: cls.__name__,
+)
+def video_chat_object(request, user1):
+    # A fresh object per test, as test_slot_behaviour adds an attribute to it
+    args = {
+        VideoChatStarted: (),
+        VideoChatEnded: (8,),
+        VideoChatParticipantsInvited: ([user1],),
+        VideoChatScheduled: (_NOW,),
+    }[request.param]
+    return request.param(*args)
+
+
+def test_slot_behaviour(video_chat_object, recwarn, mro_slots):
+    inst = video_chat_object
+    _assert_slots(inst, recwarn, mro_slots)
+    # Setting an existing attribute, e.g. VideoChatScheduled.start_date, must not warn
+    for attr in inst.__slots__:
+        setattr(inst, attr, getattr(inst, attr))
+    assert len(recwarn) == 1, recwarn.list